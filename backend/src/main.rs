@@ -255,6 +255,10 @@ async fn gui_server(
 
     loop {
         let (socket, addr) = listener.accept().await?;
+        // Satu baris JSON per paket: kirim segera, jangan ditahan Nagle
+        if let Err(e) = socket.set_nodelay(true) {
+            eprintln!("⚠️ Failed to set TCP_NODELAY for GUI {}: {}", addr, e);
+        }
         let mut data_rx = data_tx.subscribe();
         let cmd_tx_clone = cmd_tx.clone();
         println!("✅ GUI connected: {}", addr);
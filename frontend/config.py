@@ -2,16 +2,31 @@
 Configuration and constants for E-NOSE Dashboard
 """
 
+from types import MappingProxyType
+
 # Backend connection settings
 BACKEND_HOST = "127.0.0.1"
 BACKEND_PORT = 8082
 RECONNECT_DELAY = 2
+RECV_CHUNK_SIZE = 65536      # max bytes per StreamReader.read call (drains a backlog in one wakeup)
+RECV_BUFFER_SIZE = 65536     # max buffered partial line before it is dropped
 
 # Graph settings
 MAX_DATA_POINTS = 300
+GRAPH_FRAME_MS = 33          # min interval between redraws (~30 fps cap)
+# Experimental pyqtgraph OpenGL curves (needs PyOpenGL and a compatibility-profile
+# GL context; curves stop painting under RDP/VMs/some drivers). Opt-in only.
+GRAPH_USE_OPENGL = False
+
+# Log panel settings
+LOG_MAX_LINES = 500            # older lines are dropped automatically
+LOG_FLUSH_INTERVAL_MS = 250    # queued log lines are appended in one batch
+
+# CSV export settings
+CSV_WRITE_BUFFER = 1 << 20      # 1 MiB; a full sampling session is written in a few syscalls
 
 # Sensor configuration with colors (Blue/Cyan theme)
-SENSORS = {
+SENSORS = MappingProxyType({
     "NO2": "#00d9ff",    # Bright cyan
     "ETH": "#0096c7",    # Medium blue
     "VOC": "#00b4d8",    # Sky blue
@@ -19,12 +34,12 @@ SENSORS = {
     "COM": "#0077b6",    # Deep blue
     "ETHM": "#90e0ef",   # Pale cyan
     "VOCM": "#023e8a"    # Dark blue
-}
+})
 
 # FSM State configuration
 # States: IDLE(0), PRE_COND(1), RAMP_UP(2), HOLD(3), PURGE(4), RECOVERY(5), DONE(6)
 # Timing: HOLD = 60s (1min), PURGE = 120s (2min) (as per Arduino firmware)
-STATES = {
+STATES = MappingProxyType({
     "IDLE": {"color": "#888888", "desc": "Idle"},
     "PRE_COND": {"color": "#ffbe0b", "desc": "Pre-Conditioning (5s)"},
     "RAMP_UP": {"color": "#fb5607", "desc": "Ramping Up (3s)"},
@@ -32,20 +47,42 @@ STATES = {
     "PURGE": {"color": "#8338ec", "desc": "Purge (120s / 2min)"},
     "RECOVERY": {"color": "#39ff14", "desc": "Recovery (5s)"},
     "DONE": {"color": "#00ff00", "desc": "Complete"}
-}
+})
+
+# Flat lookup tables indexed by the integer FSM state sent by the firmware
+STATE_ORDER = ("IDLE", "PRE_COND", "RAMP_UP", "HOLD", "PURGE", "RECOVERY", "DONE")
+STATE_COLOR_BY_ID = tuple(STATES[n]["color"] for n in STATE_ORDER)
 
 # FSM Timing Configuration (matches Arduino firmware)
 # Arduino timing: T_HOLD = 20000ms (0s), T_PURGE = 40000ms (40s)
-TIMING = {
+TIMING = MappingProxyType({
     "PRE_COND": 5,      # 5 seconds
     "RAMP_UP": 3,       # 3 seconds
     "HOLD": 20,         # 20 seconds 
     "PURGE": 40,       # 40 seconds 
     "RECOVERY": 5       # 5 seconds
-}
+})
+
+# Sensor order as a tuple, precomputed once for hot loops (not a dict view)
+SENSOR_NAMES = tuple(SENSORS)
+
 
-# Total cycle time per level: ~193 seconds (~3.2 minutes)
-# Total for 5 levels: ~16 minutes
+def _hex_to_rgb(color: str) -> tuple:
+    """Convert '#rrggbb' ke tuple (r, g, b)"""
+    return (int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16))
+
+
+# Parsed RGB palette so the GUI never re-parses hex strings per update
+STATE_RGB = MappingProxyType({k: _hex_to_rgb(v["color"]) for k, v in STATES.items()})
+STATE_RGB_BY_ID = tuple(STATE_RGB[n] for n in STATE_ORDER)
+
+# Total cycle time per level: TIMING_TOTAL seconds (73s), 5 levels per sample
+TIMING_TOTAL = sum(TIMING.values())
+SAMPLING_LEVELS = 5
+
+# Arduino sends one packet every 250 ms; used to presize the sample buffer
+SAMPLE_RATE_HZ = 4
+EXPECTED_SAMPLES = TIMING_TOTAL * SAMPLING_LEVELS * SAMPLE_RATE_HZ
 
 
 # Edge Impulse model settings
@@ -54,4 +91,3 @@ DEFAULT_MODEL_PATH = "modelfile.eim"
 # Edge Impulse API settings for data ingestion
 EDGE_IMPULSE_API_URL = "https://ingestion.edgeimpulse.com/api/training/data"
 EDGE_IMPULSE_UPLOAD_TIMEOUT = 30  # seconds
-
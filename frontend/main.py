@@ -5,23 +5,41 @@ Simplified 3-file structure with modern dark UI
 
 import sys
 import asyncio
-import socket
 import json
-import csv
+import math
+import time
+import importlib.util
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
 from typing import Optional
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QFrame, QTextEdit, QLineEdit,
-    QFileDialog, QMessageBox
+    QPushButton, QLabel, QFrame, QPlainTextEdit, QLineEdit,
+    QFileDialog, QMessageBox, QGraphicsItem
 )
-from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject
+from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtCore import Qt, QEvent, QTimer, pyqtSignal, pyqtSlot, QObject
 import qasync
+import numpy as np
 import pyqtgraph as pg
 
-from config import BACKEND_HOST, BACKEND_PORT, RECONNECT_DELAY, MAX_DATA_POINTS, SENSORS, STATES, TIMING
+from config import (
+    BACKEND_HOST, BACKEND_PORT, RECONNECT_DELAY, RECV_CHUNK_SIZE, RECV_BUFFER_SIZE,
+    MAX_DATA_POINTS, GRAPH_FRAME_MS, GRAPH_USE_OPENGL, LOG_MAX_LINES, LOG_FLUSH_INTERVAL_MS, CSV_WRITE_BUFFER,
+    SENSOR_NAMES, TIMING,
+    STATE_ORDER, STATE_COLOR_BY_ID, STATE_RGB_BY_ID, TIMING_TOTAL, SAMPLING_LEVELS,
+    EXPECTED_SAMPLES
+)
+
+# Try to import orjson (optional, faster parsing of backend JSON lines)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Try to import Edge Impulse (optional)
 try:
@@ -46,10 +64,142 @@ except ImportError as e:
     EDGE_IMPULSE_AVAILABLE = False
 
 
+def _ei_handler_cls():
+    """EdgeImpulseHandler class; di-import ulang sekali saja jika import awal gagal"""
+    global EdgeImpulseHandler
+    if EdgeImpulseHandler is None:
+        from utils import EdgeImpulseHandler
+    return EdgeImpulseHandler
+
+
+# Precomputed sensor key set for O(1) membership checks on the hot path
+_SENSOR_KEYSET = frozenset(SENSOR_NAMES)
+
+# Wire key -> normalized (uppercase) key for every field the backend sends,
+# so the hot path does one dict lookup instead of str.upper() per key
+_KEY_MAP = {
+    k: k.upper()
+    for name in SENSOR_NAMES + ("STATE", "STATE_NAME", "LEVEL", "TIMESTAMP", "SOURCE")
+    for k in (name, name.lower())
+}
+
+
+# CSV export columns and header line, built once at import
+_CSV_FIELDNAMES = ('sample_name', 'collection_date', 'timestamp') + SENSOR_NAMES
+_CSV_HEADER = ','.join(_CSV_FIELDNAMES) + '\r\n'
+# Per-row template after the constant sample_name/collection_date prefix
+_CSV_ROW_FMT = ','.join(['%s'] * (1 + len(SENSOR_NAMES))) + '\r\n'
+
+
+# File dialog filters
+_CSV_FILE_FILTER = "CSV Files (*.csv)"
+_EIM_FILE_FILTER = "EIM Files (*.eim);;All Files (*)"
+
+
+# Backend commands with the newline terminator pre-encoded
+_CMD_BYTES = {cmd: f"{cmd}\n".encode() for cmd in ("START_SAMPLING", "STOP_SAMPLING")}
+
+
+def _normalize_packet(obj) -> Optional[dict]:
+    """
+    Uppercase semua key dan validasi nilai sensor satu kali di reader
+    
+    Returns:
+        Packet dengan key uppercase dan nilai sensor numerik & finite,
+        atau None jika paket tidak valid (dibuang utuh)
+    """
+    if not isinstance(obj, dict):
+        return None
+    packet = {_KEY_MAP.get(k) or k.upper(): v for k, v in obj.items()}
+    for key in _SENSOR_KEYSET.intersection(packet):
+        value = packet[key]
+        if type(value) not in (int, float) or not math.isfinite(value):
+            return None
+    return packet
+
+
+def _csv_field(value: str) -> str:
+    """Quote satu field CSV seperti csv.writer (dialect excel) jika perlu"""
+    if any(c in value for c in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+@lru_cache(maxsize=None)
+def _font(family: str, size: int, bold: bool = True) -> QFont:
+    """QFont bersama per (family, size, bold); dibuat saat pertama dipakai (setelah QApplication ada)"""
+    return QFont(family, size, QFont.Weight.Bold if bold else QFont.Weight.Normal)
+
+
+# ==================== SAMPLE BUFFER ====================
+class SampleBuffer:
+    """Record buffer untuk satu sesi sampling (structured NumPy array, tumbuh 2x saat penuh)"""
+
+    # 't' is time.time_ns(); sensor columns keep full float64 precision so
+    # exported values are unchanged
+    DTYPE = np.dtype([('t', 'i8')] + [(s, 'f8') for s in SENSOR_NAMES])
+
+    def __init__(self, capacity: int = EXPECTED_SAMPLES):
+        self._data = np.empty(capacity, dtype=self.DTYPE)
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def clear(self):
+        """Reset tanpa melepas memori yang sudah dialokasikan"""
+        self._len = 0
+
+    def append(self, t: int, values: list):
+        """Tambah satu record: epoch nanoseconds + nilai sensor (NaN jika tidak ada)"""
+        if self._len == len(self._data):
+            grown = np.empty(2 * len(self._data), dtype=self.DTYPE)
+            grown[:self._len] = self._data
+            self._data = grown
+        self._data[self._len] = (t, *values)
+        self._len += 1
+
+    @property
+    def records(self) -> np.ndarray:
+        """View dari record yang terisi"""
+        return self._data[:self._len]
+
+    def _timestamp_array(self) -> np.ndarray:
+        utc_us = self.records['t'] // 1000
+        # UTC offset in effect at each record's own time (DST-safe). Offsets
+        # only change on minute boundaries, so look up each distinct minute once.
+        minutes, index = np.unique(utc_us // 60_000_000, return_inverse=True)
+        offsets_s = np.array([time.localtime(int(m) * 60).tm_gmtoff for m in minutes], dtype=np.int64)
+        local_us = utc_us + offsets_s[index] * 1_000_000
+        return np.datetime_as_string(local_us.astype('datetime64[us]'), unit='us')
+
+    def timestamps(self) -> list:
+        """Format semua timestamp sekaligus sebagai ISO string waktu lokal"""
+        return self._timestamp_array().tolist()
+
+    def text_columns(self) -> list:
+        """Kolom timestamp + tiap sensor sebagai list string (NaN jadi kosong)"""
+        columns = [self.timestamps()]
+        for sensor in SENSOR_NAMES:
+            values = self.records[sensor]
+            # repr gives the shortest round-trip form, same as the csv module
+            column = list(map(repr, values.tolist()))
+            for i in np.flatnonzero(np.isnan(values)).tolist():
+                column[i] = ''
+            columns.append(column)
+        return columns
+
+    def sensor_values(self) -> np.ndarray:
+        """Array (n, len(SENSOR_NAMES)) float64 nilai sensor; NaN (tidak ada) jadi 0"""
+        # column_stack copies, so the result is safe to hand to a worker thread
+        values = np.column_stack([self.records[s] for s in SENSOR_NAMES])
+        return np.nan_to_num(values, copy=False, nan=0.0)
+
+
 # ==================== SIGNAL EMITTER ====================
 class DataSignal(QObject):
     """Signal emitter untuk komunikasi thread-safe antara async loop dan GUI"""
-    data_received = pyqtSignal(dict)
+    data_received = pyqtSignal(object)  # list packet dari satu recv chunk (tanpa konversi QVariant)
     sampling_complete = pyqtSignal()
     classification_result = pyqtSignal(dict)
 
@@ -57,6 +207,136 @@ class DataSignal(QObject):
 signal_emitter = DataSignal()
 
 
+# ==================== LOG WIDGET ====================
+class LogView(QPlainTextEdit):
+    """Log panel read-only dengan jumlah baris terbatas dan append yang di-batch"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(LOG_MAX_LINES)
+        self._pending = deque(maxlen=LOG_MAX_LINES)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start(LOG_FLUSH_INTERVAL_MS)
+
+    def append(self, text: str):
+        """Queue satu baris log; ditampilkan pada flush berikutnya"""
+        self._pending.append(text)
+
+    def flush(self):
+        """Append semua baris yang tertunda dalam satu operasi layout"""
+        if self._pending:
+            self.appendPlainText("\n".join(self._pending))
+            self._pending.clear()
+
+
+# ==================== STYLESHEETS ====================
+# Connection status label (applied only when the status actually flips)
+QSS_STATUS_CONNECTED = """
+    QLabel {
+        color: #00d9ff; 
+        padding: 12px; 
+        background: rgba(0, 217, 255, 0.2); 
+        border-radius: 10px;
+        border: 1px solid rgba(0, 217, 255, 0.4);
+        font-size: 11pt;
+    }
+"""
+
+QSS_STATUS_DISCONNECTED = """
+    color: #0096c7; 
+    padding: 8px; 
+    background: rgba(0, 150, 199, 0.15); 
+    border-radius: 8px;
+"""
+
+# Side panels (status, export & model, log) share one frame style
+QSS_PANEL_FRAME = """
+    QFrame {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+            stop:0 #1b263b, stop:1 #0d1b2a);
+        border-radius: 12px;
+        border: 2px solid rgba(0, 217, 255, 0.5);
+        padding: 15px;
+    }
+"""
+
+# State and level labels in the status panel
+QSS_INFO_LABEL = """
+    QLabel {
+        color: #00d9ff; 
+        background: rgba(0, 217, 255, 0.15); 
+        padding: 8px; 
+        border-radius: 8px;
+        border: 1px solid rgba(0, 217, 255, 0.3);
+    }
+"""
+
+# Edge Impulse credential inputs (shared by all three fields)
+QSS_EI_INPUT = """
+    QLineEdit {
+        background: rgba(10, 14, 39, 0.8);
+        color: white;
+        border: 2px solid rgba(0, 150, 199, 0.3);
+        border-radius: 6px;
+        padding: 6px;
+        font-size: 9pt;
+    }
+    QLineEdit:focus {
+        border: 2px solid #0096c7;
+        background: rgba(10, 14, 39, 1);
+    }
+"""
+
+# Level indicators: satu stylesheet untuk semua indikator, dipilih lewat
+# dynamic property "enoseLevel" (done/current/pending)
+QSS_LEVEL_INDICATORS = """
+    QLabel[enoseLevel="done"] {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 #00d9ff, stop:1 #0096c7);
+        color: #0a0e27;
+        border: 2px solid #00d9ff;
+        border-radius: 6px;
+        font-weight: bold;
+    }
+    QLabel[enoseLevel="current"] {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 #48cae4, stop:1 #00d9ff);
+        color: #0a0e27;
+        border: 3px solid #00d9ff;
+        border-radius: 8px;
+        font-weight: bold;
+    }
+    QLabel[enoseLevel="pending"] {
+        background: rgba(255, 255, 255, 0.05);
+        color: #555;
+        border: 2px solid #333;
+        border-radius: 8px;
+        font-weight: bold;
+    }
+"""
+
+
+def _state_label_qss(color: str, rgb: tuple) -> str:
+    """Stylesheet untuk state label dengan warna state tertentu"""
+    r, g, b = rgb
+    return f"""
+        color: {color}; 
+        background: rgba({r}, {g}, {b}, 0.15); 
+        padding: 6px; 
+        border-radius: 6px;
+        font-weight: bold;
+    """
+
+
+# One precomputed stylesheet per FSM state id, plus a fallback for unknown names
+QSS_STATE_BY_ID = tuple(_state_label_qss(c, rgb) for c, rgb in zip(STATE_COLOR_BY_ID, STATE_RGB_BY_ID))
+QSS_STATE_BY_NAME = dict(zip(STATE_ORDER, QSS_STATE_BY_ID))
+QSS_STATE_UNKNOWN = _state_label_qss("#ffffff", (255, 255, 255))
+
+
 # ==================== MAIN GUI ====================
 class ENoseGUI(QMainWindow):
     """Main GUI window untuk E-NOSE Dashboard"""
@@ -67,10 +347,16 @@ class ENoseGUI(QMainWindow):
         self.resize(1300, 650)
         self.setMinimumSize(1100, 550)
 
-        self._sock: Optional[socket.socket] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
         self.connected = False
-        self.current_sample_data = []
+        self._status_qss = None
+        self._packets = []  # parsed packets pending for the next batch emit
+        self.current_sample_data = SampleBuffer()
         self.is_sampling = False
+        self._drawn_head = 0  # buf_head value the plot lines were last drawn at
+        self._last_state_name = None
+        self._last_level = 0  # All level indicators start as pending
+        self._level_text = None
         
         # Initialize Edge Impulse (if available)
         if EDGE_IMPULSE_AVAILABLE:
@@ -78,6 +364,18 @@ class ENoseGUI(QMainWindow):
         else:
             self.ei_handler = None
 
+        # Single worker keeps ImpulseRunner calls serialized and off the GUI thread
+        self._ei_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ei-runner")
+        self._classify_future = None
+        self._upload_task = None
+        self._csv_upload_task = None
+        self._model_task = None
+        self._ei_creds = None
+
+        # Reusable information dialog (see show_info)
+        self._info_box = QMessageBox(self)
+        self._info_box.setIcon(QMessageBox.Icon.Information)
+
         self._setup_ui()
         self._connect_signals()
 
@@ -98,7 +396,7 @@ class ENoseGUI(QMainWindow):
         
         # Title dengan gradient modern dan glow effect
         title = QLabel("🔬 E-NOSE REALTIME MONITORING")
-        title.setFont(QFont("Segoe UI", 20, QFont.Weight.Bold))
+        title.setFont(_font("Segoe UI", 20))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title.setStyleSheet("""
             QLabel {
@@ -126,10 +424,12 @@ class ENoseGUI(QMainWindow):
         # Right: Controls
         self._setup_controls(main_layout)
 
-        # Timer untuk update graph
-        self.timer = QTimer()
+        # Single-shot frame timer: armed when new data arrives, so bursts of
+        # packets coalesce into one redraw and an idle link costs no wakeups
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(GRAPH_FRAME_MS)
         self.timer.timeout.connect(self.update_graph)
-        self.timer.start(100)
 
     def _setup_graph(self, parent_layout):
         """Setup graph area dengan tema gelap"""
@@ -148,7 +448,7 @@ class ENoseGUI(QMainWindow):
         graph_layout.setSpacing(5)
 
         graph_title = QLabel("📊 Real-Time Sensor Data")
-        graph_title.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        graph_title.setFont(_font("Segoe UI", 12))
         graph_title.setStyleSheet("""
             color: #00d9ff; 
             padding: 8px;
@@ -162,12 +462,14 @@ class ENoseGUI(QMainWindow):
         self.graph.setLabel('bottom', 'Samples', color='#ffffff', size='11pt')
         self.graph.showGrid(x=True, y=True, alpha=0.1)
         self.graph.setBackground('#0a0e27')
+        # Only build paths for visible, pixel-sized buckets of data
+        self.graph.setDownsampling(mode='peak', auto=True)
+        self.graph.setClipToView(True)
         
         legend = self.graph.addLegend(offset=(10, 10), labelTextColor='#ffffff')
 
         # Setup plot lines dengan warna neon
         self.lines = {}
-        self.data_buffers = {}
         
         neon_colors = {
             "NO2": "#ff006e",    # Hot pink
@@ -179,17 +481,26 @@ class ENoseGUI(QMainWindow):
             "VOCM": "#3a86ff"    # Royal blue
         }
         
-        for sensor in SENSORS.keys():
-            color = neon_colors.get(sensor, "#ffffff")
+        # Parse each colour once into a QColor-backed pen
+        neon_pens = {
+            sensor: pg.mkPen(QColor(neon_colors.get(sensor, "#ffffff")), width=3)
+            for sensor in SENSOR_NAMES
+        }
+        
+        for sensor in SENSOR_NAMES:
+            # No per-point symbols: they force one draw call per sample
             self.lines[sensor] = self.graph.plot(
                 [], [], 
-                pen=pg.mkPen(color, width=3), 
-                name=sensor,
-                symbol='o', 
-                symbolSize=3,
-                symbolBrush=color
+                pen=neon_pens[sensor], 
+                name=sensor
             )
-            self.data_buffers[sensor] = []
+            self.lines[sensor].setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+        # Single 2D ring buffer, sensor-major (one contiguous row per sensor in
+        # SENSOR_NAMES order, one column per packet), filled up to self.buf_head
+        self._ring = np.zeros((len(SENSOR_NAMES), MAX_DATA_POINTS), dtype=np.float32)
+        self.buf_head = 0
+        self._x_axis = np.arange(MAX_DATA_POINTS, dtype=np.int32)
 
         graph_layout.addWidget(self.graph, stretch=1)
         parent_layout.addWidget(graph_frame, stretch=3)
@@ -228,21 +539,13 @@ class ENoseGUI(QMainWindow):
     def _setup_status_panel(self, parent_layout):
         """Setup status panel"""
         status_frame = QFrame()
-        status_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1b263b, stop:1 #0d1b2a);
-                border-radius: 12px;
-                border: 2px solid rgba(0, 217, 255, 0.5);
-                padding: 15px;
-            }
-        """)
+        status_frame.setStyleSheet(QSS_PANEL_FRAME)
         status_layout = QVBoxLayout(status_frame)
         status_layout.setContentsMargins(8, 8, 8, 8)
         status_layout.setSpacing(6)
 
         self.status = QLabel("🔴 Disconnected")
-        self.status.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.status.setFont(_font("Segoe UI", 10))
         self.status.setStyleSheet("""
             QLabel {
                 color: #0096c7; 
@@ -261,30 +564,14 @@ class ENoseGUI(QMainWindow):
         info_layout.setSpacing(6)
         
         self.state_label = QLabel("STATE: —")
-        self.state_label.setFont(QFont("Consolas", 10, QFont.Weight.Bold))
-        self.state_label.setStyleSheet("""
-            QLabel {
-                color: #00d9ff; 
-                background: rgba(0, 217, 255, 0.15); 
-                padding: 8px; 
-                border-radius: 8px;
-                border: 1px solid rgba(0, 217, 255, 0.3);
-            }
-        """)
+        self.state_label.setFont(_font("Consolas", 10))
+        self.state_label.setStyleSheet(QSS_INFO_LABEL)
         self.state_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         info_layout.addWidget(self.state_label)
 
         self.level_label = QLabel("LVL: —")
-        self.level_label.setFont(QFont("Consolas", 10, QFont.Weight.Bold))
-        self.level_label.setStyleSheet("""
-            QLabel {
-                color: #00d9ff; 
-                background: rgba(0, 217, 255, 0.15); 
-                padding: 8px; 
-                border-radius: 8px;
-                border: 1px solid rgba(0, 217, 255, 0.3);
-            }
-        """)
+        self.level_label.setFont(_font("Consolas", 10))
+        self.level_label.setStyleSheet(QSS_INFO_LABEL)
         self.level_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         info_layout.addWidget(self.level_label)
         
@@ -299,14 +586,14 @@ class ENoseGUI(QMainWindow):
                 padding: 12px;
                 border: 1px solid rgba(0, 217, 255, 0.2);
             }
-        """)
+        """ + QSS_LEVEL_INDICATORS)
         progress_layout = QVBoxLayout(progress_container)
         progress_layout.setContentsMargins(8, 8, 8, 8)
         progress_layout.setSpacing(4)
 
         # Progress title
         progress_title = QLabel("LEVEL PROGRESS")
-        progress_title.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        progress_title.setFont(_font("Segoe UI", 10))
         progress_title.setStyleSheet("""
             color: #00d9ff; 
             padding: 4px;
@@ -322,19 +609,11 @@ class ENoseGUI(QMainWindow):
         self.level_indicators = []
         for i in range(1, 6):
             level_box = QLabel(str(i))
-            level_box.setFont(QFont("Consolas", 11, QFont.Weight.Bold))
+            level_box.setFont(_font("Consolas", 11))
             level_box.setAlignment(Qt.AlignmentFlag.AlignCenter)
             level_box.setMinimumSize(40, 40)
             level_box.setMaximumSize(40, 40)
-            level_box.setStyleSheet("""
-                QLabel {
-                    background: rgba(255, 255, 255, 0.05);
-                    color: #555;
-                    border: 2px solid #333;
-                    border-radius: 8px;
-                    font-weight: bold;
-                }
-            """)
+            level_box.setProperty("enoseLevel", "pending")
             self.level_indicators.append(level_box)
             level_bar_layout.addWidget(level_box)
         
@@ -343,7 +622,7 @@ class ENoseGUI(QMainWindow):
 
         # Prediction Label
         self.pred_label = QLabel("PREDICTION: —")
-        self.pred_label.setFont(QFont("Consolas", 11, QFont.Weight.Bold))
+        self.pred_label.setFont(_font("Consolas", 11))
         self.pred_label.setStyleSheet("""
             QLabel {
                 color: white; 
@@ -377,7 +656,7 @@ class ENoseGUI(QMainWindow):
         btn_layout.setContentsMargins(8, 8, 8, 8)
 
         self.btn_start = QPushButton("▶ START SAMPLING")
-        self.btn_start.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.btn_start.setFont(_font("Segoe UI", 10))
         self.btn_start.setMinimumHeight(28)
         self.btn_start.setCursor(Qt.CursorShape.PointingHandCursor)
         self.btn_start.setStyleSheet("""
@@ -405,7 +684,7 @@ class ENoseGUI(QMainWindow):
         btn_layout.addWidget(self.btn_start)
 
         self.btn_stop = QPushButton("⏹ STOP SAMPLING")
-        self.btn_stop.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.btn_stop.setFont(_font("Segoe UI", 10))
         self.btn_stop.setMinimumHeight(28)
         self.btn_stop.setCursor(Qt.CursorShape.PointingHandCursor)
         self.btn_stop.setStyleSheet("""
@@ -433,7 +712,7 @@ class ENoseGUI(QMainWindow):
         btn_layout.addWidget(self.btn_stop)
 
         self.btn_clear = QPushButton("🗑 CLEAR GRAPH")
-        self.btn_clear.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        self.btn_clear.setFont(_font("Segoe UI", 10))
         self.btn_clear.setMinimumHeight(28)
         self.btn_clear.setCursor(Qt.CursorShape.PointingHandCursor)
         self.btn_clear.setStyleSheet("""
@@ -465,21 +744,13 @@ class ENoseGUI(QMainWindow):
     def _setup_csv_panel(self, parent_layout):
         """Setup CSV export and model loading panel"""
         csv_frame = QFrame()
-        csv_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1b263b, stop:1 #0d1b2a);
-                border-radius: 12px;
-                border: 2px solid rgba(0, 217, 255, 0.5);
-                padding: 15px;
-            }
-        """)
+        csv_frame.setStyleSheet(QSS_PANEL_FRAME)
         csv_layout = QVBoxLayout(csv_frame)
         csv_layout.setSpacing(3)
         csv_layout.setContentsMargins(6, 6, 6, 6)
 
         csv_title = QLabel("💾 Export & Model")
-        csv_title.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+        csv_title.setFont(_font("Segoe UI", 10))
         csv_title.setStyleSheet("color: #00d9ff; padding: 2px;")
         csv_layout.addWidget(csv_title)
 
@@ -487,7 +758,7 @@ class ENoseGUI(QMainWindow):
         self.sample_name_input.setPlaceholderText("Sample name...")
         self.sample_name_input.setMinimumHeight(22)
         self.sample_name_input.setMaximumHeight(22)
-        self.sample_name_input.setFont(QFont("Segoe UI", 8))
+        self.sample_name_input.setFont(_font("Segoe UI", 8, bold=False))
         self.sample_name_input.setStyleSheet("""
             QLineEdit {
                 background: rgba(10, 14, 39, 0.8);
@@ -510,21 +781,8 @@ class ENoseGUI(QMainWindow):
         self.ei_api_key_input.setEchoMode(QLineEdit.EchoMode.Password)
         self.ei_api_key_input.setMinimumHeight(22)
         self.ei_api_key_input.setMaximumHeight(22)
-        self.ei_api_key_input.setFont(QFont("Segoe UI", 8))
-        self.ei_api_key_input.setStyleSheet("""
-            QLineEdit {
-                background: rgba(10, 14, 39, 0.8);
-                color: white;
-                border: 2px solid rgba(0, 150, 199, 0.3);
-                border-radius: 6px;
-                padding: 6px;
-                font-size: 9pt;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0096c7;
-                background: rgba(10, 14, 39, 1);
-            }
-        """)
+        self.ei_api_key_input.setFont(_font("Segoe UI", 8, bold=False))
+        self.ei_api_key_input.setStyleSheet(QSS_EI_INPUT)
         csv_layout.addWidget(self.ei_api_key_input)
 
         # Edge Impulse Project ID Input
@@ -532,21 +790,8 @@ class ENoseGUI(QMainWindow):
         self.ei_project_id_input.setPlaceholderText("Project ID...")
         self.ei_project_id_input.setMinimumHeight(22)
         self.ei_project_id_input.setMaximumHeight(22)
-        self.ei_project_id_input.setFont(QFont("Segoe UI", 8))
-        self.ei_project_id_input.setStyleSheet("""
-            QLineEdit {
-                background: rgba(10, 14, 39, 0.8);
-                color: white;
-                border: 2px solid rgba(0, 150, 199, 0.3);
-                border-radius: 6px;
-                padding: 6px;
-                font-size: 9pt;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0096c7;
-                background: rgba(10, 14, 39, 1);
-            }
-        """)
+        self.ei_project_id_input.setFont(_font("Segoe UI", 8, bold=False))
+        self.ei_project_id_input.setStyleSheet(QSS_EI_INPUT)
         csv_layout.addWidget(self.ei_project_id_input)
 
         # Edge Impulse Label Input
@@ -554,25 +799,12 @@ class ENoseGUI(QMainWindow):
         self.ei_label_input.setPlaceholderText("Label (coffee, tea...)")
         self.ei_label_input.setMinimumHeight(22)
         self.ei_label_input.setMaximumHeight(22)
-        self.ei_label_input.setFont(QFont("Segoe UI", 8))
-        self.ei_label_input.setStyleSheet("""
-            QLineEdit {
-                background: rgba(10, 14, 39, 0.8);
-                color: white;
-                border: 2px solid rgba(0, 150, 199, 0.3);
-                border-radius: 6px;
-                padding: 6px;
-                font-size: 9pt;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0096c7;
-                background: rgba(10, 14, 39, 1);
-            }
-        """)
+        self.ei_label_input.setFont(_font("Segoe UI", 8, bold=False))
+        self.ei_label_input.setStyleSheet(QSS_EI_INPUT)
         csv_layout.addWidget(self.ei_label_input)
 
         self.btn_save_csv = QPushButton("💾 SAVE CSV")
-        self.btn_save_csv.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
+        self.btn_save_csv.setFont(_font("Segoe UI", 9))
         self.btn_save_csv.setMinimumHeight(22)
         self.btn_save_csv.setMaximumHeight(22)
         self.btn_save_csv.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -602,7 +834,7 @@ class ENoseGUI(QMainWindow):
         # Model Control
         # Upload to Edge Impulse Button
         self.btn_upload_ei = QPushButton("📤 UPLOAD TO EI")
-        self.btn_upload_ei.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
+        self.btn_upload_ei.setFont(_font("Segoe UI", 9))
         self.btn_upload_ei.setMinimumHeight(22)
         self.btn_upload_ei.setMaximumHeight(22)
         self.btn_upload_ei.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -630,7 +862,7 @@ class ENoseGUI(QMainWindow):
         csv_layout.addWidget(self.btn_upload_ei)
 
         model_btn = QPushButton("📂 LOAD MODEL")
-        model_btn.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
+        model_btn.setFont(_font("Segoe UI", 9))
         model_btn.setMinimumHeight(22)
         model_btn.setMaximumHeight(22)
         model_btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -662,28 +894,19 @@ class ENoseGUI(QMainWindow):
     def _setup_log_panel(self, parent_layout):
         """Setup log panel"""
         log_frame = QFrame()
-        log_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1b263b, stop:1 #0d1b2a);
-                border-radius: 12px;
-                border: 2px solid rgba(0, 217, 255, 0.5);
-                padding: 15px;
-            }
-        """)
+        log_frame.setStyleSheet(QSS_PANEL_FRAME)
         log_layout = QVBoxLayout(log_frame)
         log_layout.setSpacing(5)
         log_layout.setContentsMargins(8, 8, 8, 8)
 
         log_title = QLabel("📋 System Log")
-        log_title.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        log_title.setFont(_font("Segoe UI", 11))
         log_title.setStyleSheet("color: #00d9ff; padding: 5px;")
         log_layout.addWidget(log_title)
 
-        self.log = QTextEdit()
-        self.log.setReadOnly(True)
+        self.log = LogView()
         self.log.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background: #0a0e27;
                 color: #00d9ff;
                 border: none;
@@ -698,41 +921,82 @@ class ENoseGUI(QMainWindow):
 
         parent_layout.addWidget(log_frame, stretch=1)
 
+    def show_info(self, title: str, message: str):
+        """Tampilkan pesan informasi memakai satu QMessageBox yang di-reuse"""
+        if self._info_box.isVisible():
+            # The shared box is already open (nested event); don't re-enter exec()
+            QMessageBox.information(self, title, message)
+            return
+        self._info_box.setWindowTitle(title)
+        self._info_box.setText(message)
+        self._info_box.exec()
+
+    def _show_after_task(self, show, *args):
+        """
+        Tampilkan dialog modal dari dalam coroutine, setelah task-nya selesai
+        
+        exec() di dalam task asyncio menjalankan event loop bersarang; qasync
+        lalu mencoba menjalankan task lain (mis. connect_backend) saat task ini
+        masih aktif, dan task itu mati dengan RuntimeError. Dijadwalkan lewat
+        QTimer, dialog dibuka dari event Qt biasa di luar task.
+        """
+        QTimer.singleShot(0, partial(show, *args))
+
     def _connect_signals(self):
         """Connect all signals"""
-        signal_emitter.data_received.connect(self.on_data_received)
+        # Emitted from the qasync loop on the GUI thread: deliver directly,
+        # without posting an event per batch
+        signal_emitter.data_received.connect(
+            self.on_packets_received, Qt.ConnectionType.DirectConnection
+        )
         signal_emitter.sampling_complete.connect(self.on_sampling_complete)
         signal_emitter.classification_result.connect(self.update_prediction)
 
+        for field in (self.ei_api_key_input, self.ei_project_id_input, self.ei_label_input):
+            field.textChanged.connect(self._invalidate_ei_creds)
+
+    def _invalidate_ei_creds(self):
+        self._ei_creds = None
+
+    def _ei_credentials(self) -> tuple:
+        """(api_key, project_id, label) dari input; di-cache sampai salah satu field berubah"""
+        if self._ei_creds is None:
+            self._ei_creds = (
+                self.ei_api_key_input.text().strip(),
+                self.ei_project_id_input.text().strip(),
+                self.ei_label_input.text().strip(),
+            )
+        return self._ei_creds
+
     # Event handlers
     def start_sampling_clicked(self):
         """Reset data dan mulai sampling baru"""
-        self.current_sample_data = []
+        self.current_sample_data.clear()
         self.is_sampling = True
         self.log.append("🔄 Starting sampling...")
-        self.log.append(f"⏱ Hold: {TIMING['HOLD']}s | Purge: {TIMING['PURGE']}s | Total: ~{int((TIMING['PRE_COND'] + TIMING['RAMP_UP'] + TIMING['HOLD'] + TIMING['PURGE'] + TIMING['RECOVERY']) * 5 / 60)}min")
+        self.log.append(f"⏱ Hold: {TIMING['HOLD']}s | Purge: {TIMING['PURGE']}s | Total: ~{int(TIMING_TOTAL * SAMPLING_LEVELS / 60)}min")
         asyncio.create_task(self.send_cmd("START_SAMPLING"))
 
     def clear_graph(self):
         """Clear all graph data and reset for new sample"""
-        # Clear all data buffers
-        for sensor in self.data_buffers.keys():
-            self.data_buffers[sensor] = []
+        # Clear all data buffers (ring buffers are reused, only the head resets)
+        self.buf_head = 0
+        self._drawn_head = 0
+        
+        # Empty the curves in place; pens and plot items are kept, and the
+        # plot repaints once for all of them
+        self.graph.setUpdatesEnabled(False)
+        try:
+            for line in self.lines.values():
+                line.clear()
+        finally:
+            self.graph.setUpdatesEnabled(True)
         
         # Clear current sample data
-        self.current_sample_data = []
+        self.current_sample_data.clear()
         
         # Reset level indicators to default state
-        for indicator in self.level_indicators:
-            indicator.setStyleSheet("""
-                QLabel {
-                    background: rgba(255, 255, 255, 0.05);
-                    color: #555;
-                    border: 2px solid #333;
-                    border-radius: 8px;
-                    font-weight: bold;
-                }
-            """)
+        self.update_level_progress(0)
         
         # Reset prediction label
         self.pred_label.setText("PREDICTION: —")
@@ -740,8 +1004,7 @@ class ENoseGUI(QMainWindow):
         # Log the action
         self.log.append("🗑 Graph cleared - Ready for new sample")
         
-        QMessageBox.information(
-            self,
+        self.show_info(
             "Graph Cleared",
             "All graph data has been cleared.\nReady for new sample collection."
         )
@@ -753,118 +1016,172 @@ class ENoseGUI(QMainWindow):
         self.log.append(f"📊 Total: {len(self.current_sample_data)} samples")
         
         # Auto-upload to Edge Impulse if credentials are provided
-        api_key = self.ei_api_key_input.text().strip()
-        project_id = self.ei_project_id_input.text().strip()
-        label = self.ei_label_input.text().strip()
+        api_key, project_id, label = self._ei_credentials()
         
         if api_key and project_id and label and self.current_sample_data:
             self.log.append("📤 Auto-uploading to Edge Impulse...")
-            try:
-                # Prepare data directly from current_sample_data
-                if EDGE_IMPULSE_AVAILABLE and self.ei_handler:
-                    result = self.ei_handler.upload_data_to_edge_impulse(
-                        data=self.current_sample_data,
-                        api_key=api_key,
-                        project_id=project_id,
-                        label=label
-                    )
-                else:
-                    from utils import EdgeImpulseHandler
-                    result = EdgeImpulseHandler.upload_data_to_edge_impulse(
-                        data=self.current_sample_data,
-                        api_key=api_key,
-                        project_id=project_id,
-                        label=label
-                    )
-                
-                if result['success']:
-                    self.log.append(f"✅ {result['message']}")
-                    QMessageBox.information(
-                        self,
-                        "Complete",
-                        f"Sampling finished!\n\nSamples: {len(self.current_sample_data)}\n\n✅ Auto-uploaded to Edge Impulse!\nLabel: {label}"
-                    )
-                else:
-                    self.log.append(f"⚠️ Upload warning: {result['message']}")
-                    QMessageBox.information(
-                        self,
-                        "Complete",
-                        f"Sampling finished!\n\nSamples: {len(self.current_sample_data)}\n\n⚠️ Upload failed: {result['message']}"
-                    )
-            except Exception as e:
-                self.log.append(f"⚠️ Upload error: {str(e)}")
-                QMessageBox.information(
-                    self,
-                    "Complete",
-                    f"Sampling finished!\n\nSamples: {len(self.current_sample_data)}\n\n⚠️ Upload error: {str(e)}"
+            # Upload runs in a worker thread; the GUI and recv loop keep running
+            self._upload_task = asyncio.create_task(
+                self._auto_upload(
+                    self.current_sample_data.timestamps(),
+                    self.current_sample_data.sensor_values(),
+                    api_key, project_id, label
                 )
+            )
         else:
-            # No auto-upload, just show completion
-            QMessageBox.information(
-                self,
+            # No auto-upload, just show completion. Emitted from the recv loop
+            # task, so the modal dialog must open outside it
+            self._show_after_task(
+                self.show_info,
                 "Complete",
                 f"Sampling finished!\n\nSamples: {len(self.current_sample_data)}\nReady to save CSV."
             )
 
-    def on_data_received(self, data: dict):
-        """Handle data dari async loop"""
-        # Normalize field names to uppercase
-        normalized_data = {k.upper(): v for k, v in data.items()}
-        
-        if self.is_sampling:
-            data_row = {'timestamp': datetime.now().isoformat()}
-            
-            for k, v in normalized_data.items():
-                key = k.upper()
-                if key in self.data_buffers:
-                    try:
-                        value = float(v)
-                        self.data_buffers[key].append(value)
-                        data_row[key] = value
-                        
-                        if len(self.data_buffers[key]) > MAX_DATA_POINTS:
-                            self.data_buffers[key].pop(0)
-                    except:
-                        pass
+    async def _auto_upload(self, timestamps: list, values: np.ndarray, api_key: str, project_id: str, label: str):
+        """Upload hasil sampling ke Edge Impulse tanpa memblokir GUI"""
+        try:
+            # Prepare data directly from current_sample_data
+            if EDGE_IMPULSE_AVAILABLE and self.ei_handler:
+                upload = self.ei_handler.upload_data_to_edge_impulse
+            else:
+                upload = _ei_handler_cls().upload_data_to_edge_impulse
+
+            result = await asyncio.to_thread(
+                upload,
+                timestamps=timestamps,
+                values=values,
+                api_key=api_key,
+                project_id=project_id,
+                label=label
+            )
             
-            if any(k in data_row for k in SENSORS.keys()):
-                self.current_sample_data.append(data_row)
+            if result['success']:
+                self.log.append(f"✅ {result['message']}")
+                self._show_after_task(
+                    self.show_info,
+                    "Complete",
+                    f"Sampling finished!\n\nSamples: {len(timestamps)}\n\n✅ Auto-uploaded to Edge Impulse!\nLabel: {label}"
+                )
+            else:
+                self.log.append(f"⚠️ Upload warning: {result['message']}")
+                self._show_after_task(
+                    self.show_info,
+                    "Complete",
+                    f"Sampling finished!\n\nSamples: {len(timestamps)}\n\n⚠️ Upload failed: {result['message']}"
+                )
+        except Exception as e:
+            self.log.append(f"⚠️ Upload error: {str(e)}")
+            self._show_after_task(
+                self.show_info,
+                "Complete",
+                f"Sampling finished!\n\nSamples: {len(timestamps)}\n\n⚠️ Upload error: {str(e)}"
+            )
 
-        # Update state display with color coding
-        if 'STATE_NAME' in normalized_data:
-            state_name = normalized_data['STATE_NAME']
-            state_config = STATES.get(state_name, {"color": "#ffffff", "desc": state_name})
-            self.state_label.setText(f"STATE: {state_name}")
-            self.state_label.setStyleSheet(f"""
-                color: {state_config['color']}; 
-                background: rgba({int(state_config['color'][1:3], 16)}, {int(state_config['color'][3:5], 16)}, {int(state_config['color'][5:7], 16)}, 0.15); 
-                padding: 6px; 
-                border-radius: 6px;
-                font-weight: bold;
-            """)
-        elif 'STATE' in normalized_data:
-            # Fallback if state_name not available
-            self.state_label.setText(f"STATE: {normalized_data['STATE']}")
-        
-        # Update level display and progress bar
-        if 'LEVEL' in normalized_data:
-            try:
-                current_level = int(normalized_data['LEVEL'])
-                self.level_label.setText(f"LVL: {current_level}")
-                self.update_level_progress(current_level)
-            except (ValueError, TypeError):
-                self.level_label.setText(f"LVL: {normalized_data['LEVEL']}")
+    @pyqtSlot(object)
+    def on_packets_received(self, packets: list):
+        """Handle satu batch packet (satu signal per recv chunk)"""
+        # Every packet is recorded, but the state/level widgets only need the
+        # newest value in the batch
+        state_packet = level_packet = None
+        for data in packets:
+            self.on_data_received(data)
+            if 'STATE' in data or 'STATE_NAME' in data:
+                state_packet = data
+            if 'LEVEL' in data:
+                level_packet = data
+
+        if state_packet is not None:
+            self._show_state(state_packet)
+        if level_packet is not None:
+            self._show_level(level_packet['LEVEL'])
+        self._schedule_graph_update()
+
+    def _schedule_graph_update(self):
+        """Jadwalkan satu redraw di frame berikutnya jika ada data baru"""
+        if self.buf_head != self._drawn_head and not self.timer.isActive():
+            self.timer.start()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange and not self.isMinimized():
+            # Catch up on data that arrived while minimized
+            self._schedule_graph_update()
+
+    def on_data_received(self, data: dict):
+        """Rekam, log dan klasifikasi satu packet (sudah dinormalisasi & divalidasi oleh reader)"""
+        # Single C-level set check, reused by the buffer, log and classifier paths
+        has_sensor = not _SENSOR_KEYSET.isdisjoint(data)
+
+        if self.is_sampling and has_sensor:
+            # Extract all sensors in fixed order in one shot (NaN if missing);
+            # values are already validated numbers, so no try/except needed
+            row = np.fromiter(
+                (data.get(k, np.nan) for k in SENSOR_NAMES),
+                dtype=np.float64, count=len(SENSOR_NAMES)
+            )
+
+            # Single column store; advance the shared head once per packet
+            self._ring[:, self.buf_head % MAX_DATA_POINTS] = row
+            self.buf_head += 1
+
+            self.current_sample_data.append(time.time_ns(), row.tolist())
 
         # Compact log
-        if any(k.upper() in SENSORS for k in data.keys()):
-            sensor_str = ", ".join([f"{k}:{v:.1f}" for k,v in data.items() if k.upper() in SENSORS])
+        if has_sensor:
+            sensor_str = ", ".join(f"{k}:{v:.1f}" for k, v in data.items() if k in _SENSOR_KEYSET)
             self.log.append(f"✅ {sensor_str}")
             
-            # Run classification (if Edge Impulse available)
-            if self.ei_handler:
-                res = self.ei_handler.classify(normalized_data)
-                if res:
-                    signal_emitter.classification_result.emit(res)
+            # Run classification in the background (if a model is loaded).
+            # Drop-newest: skip this packet while a previous classify is in flight.
+            if self.ei_handler and self.ei_handler.initialized and self._classify_future is None:
+                self._classify_future = self._ei_executor.submit(
+                    self.ei_handler.classify, data
+                )
+                self._classify_future.add_done_callback(self._on_classify_done)
+
+    def _show_state(self, data: dict):
+        """Update state label (dengan warna state) dari packet terbaru"""
+        # Prefer the integer FSM state (single tuple index), fall back to state_name
+        state_id = data.get('STATE')
+        if isinstance(state_id, int) and 0 <= state_id < len(STATE_ORDER):
+            state_name = STATE_ORDER[state_id]
+            state_qss = QSS_STATE_BY_ID[state_id]
+        elif 'STATE_NAME' in data:
+            state_name = data['STATE_NAME']
+            state_qss = QSS_STATE_BY_NAME.get(state_name, QSS_STATE_UNKNOWN)
+        else:
+            # Fallback if state_name not available
+            self._last_state_name = None
+            self.state_label.setText(f"STATE: {data['STATE']}")
+            return
+
+        # Skip the Qt re-polish entirely while the state is unchanged
+        if state_name != self._last_state_name:
+            self._last_state_name = state_name
+            self.state_label.setText(f"STATE: {state_name}")
+            self.state_label.setStyleSheet(state_qss)
+
+    def _show_level(self, level):
+        """Update level label dan progress bar dari packet terbaru"""
+        try:
+            current_level = int(level)
+        except (ValueError, TypeError):
+            text = f"LVL: {level}"
+        else:
+            text = f"LVL: {current_level}"
+            self.update_level_progress(current_level)
+        if text != self._level_text:
+            self._level_text = text
+            self.level_label.setText(text)
+
+    def _on_classify_done(self, future):
+        """Callback dari worker thread; hasil dikirim ke GUI lewat signal"""
+        self._classify_future = None
+        if future.cancelled() or future.exception() is not None:
+            return
+        res = future.result()
+        if res:
+            signal_emitter.classification_result.emit(res)
 
     def update_prediction(self, result: dict):
         """Update prediction label"""
@@ -873,52 +1190,72 @@ class ENoseGUI(QMainWindow):
             confidence = result["classification"][best_label]
             self.pred_label.setText(f"PRED: {best_label} ({confidence:.2f})")
 
+    @staticmethod
+    def _level_state(i: int, current_level: int) -> str:
+        """State indikator level ke-i saat level aktif = current_level"""
+        if i < current_level:
+            # Completed levels - green gradient
+            return "done"
+        elif i == current_level:
+            # Current level - bright cyan with stronger glow
+            return "current"
+        # Pending levels - dark/inactive with subtle border
+        return "pending"
+
+    @staticmethod
+    def _set_level_state(indicator: QLabel, state: str):
+        """Ganti property enoseLevel dan re-polish (tanpa parse ulang stylesheet)"""
+        indicator.setProperty("enoseLevel", state)
+        style = indicator.style()
+        style.unpolish(indicator)
+        style.polish(indicator)
+
     def update_level_progress(self, current_level: int):
         """Update visual progress bar for levels 1-5"""
-        for i, indicator in enumerate(self.level_indicators, start=1):
-            if i < current_level:
-                # Completed levels - green gradient
-                indicator.setStyleSheet("""
-                    QLabel {
-                        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                            stop:0 #00d9ff, stop:1 #0096c7);
-                        color: #0a0e27;
-                        border: 2px solid #00d9ff;
-                        border-radius: 6px;
-                        font-weight: bold;
-                    }
-                """)
-            elif i == current_level:
-                # Current level - bright cyan with stronger glow
-                indicator.setStyleSheet("""
-                    QLabel {
-                        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                            stop:0 #48cae4, stop:1 #00d9ff);
-                        color: #0a0e27;
-                        border: 3px solid #00d9ff;
-                        border-radius: 8px;
-                        font-weight: bold;
-                    }
-                """)
-            else:
-                # Pending levels - dark/inactive with subtle border
-                indicator.setStyleSheet("""
-                    QLabel {
-                        background: rgba(255, 255, 255, 0.05);
-                        color: #555;
-                        border: 2px solid #333;
-                        border-radius: 8px;
-                        font-weight: bold;
-                    }
-                """)
+        previous_level = self._last_level
+        if current_level == previous_level:
+            return
+        self._last_level = current_level
+
+        # Only re-polish indicators whose visual state actually changed, with
+        # painting of the shared container held so they repaint once together
+        container = self.level_indicators[0].parentWidget()
+        container.setUpdatesEnabled(False)
+        try:
+            for i, indicator in enumerate(self.level_indicators, start=1):
+                state = self._level_state(i, current_level)
+                if state != self._level_state(i, previous_level):
+                    self._set_level_state(indicator, state)
+        finally:
+            container.setUpdatesEnabled(True)
 
 
     def update_graph(self):
-        """Update semua line di graph"""
-        for sensor, line in self.lines.items():
-            buf = self.data_buffers[sensor]
-            if buf:
-                line.setData(list(range(len(buf))), buf)
+        """Update line di graph jika ada packet baru sejak redraw terakhir"""
+        if self.buf_head == self._drawn_head:
+            return
+        if self.isMinimized() or not self.graph.isVisible():
+            # Nothing on screen to repaint; the head diff is kept for the next tick
+            return
+
+        # Unroll the ring buffer (oldest -> newest) only here, at render time
+        n = min(self.buf_head, MAX_DATA_POINTS)
+        wrapped = self.buf_head > MAX_DATA_POINTS
+        start = self.buf_head % MAX_DATA_POINTS
+        x = self._x_axis[:n]
+        if wrapped:
+            # One copy for all sensors; every row of the result is contiguous
+            ys = np.concatenate((self._ring[:, start:], self._ring[:, :start]), axis=1)
+        else:
+            ys = self._ring[:, :n]
+
+        self.graph.setUpdatesEnabled(False)
+        try:
+            for line, y in zip(self.lines.values(), ys):
+                line.setData(x, y)
+        finally:
+            self.graph.setUpdatesEnabled(True)
+        self._drawn_head = self.buf_head
 
     def save_to_csv(self):
         """Save current sample data to CSV"""
@@ -936,29 +1273,22 @@ class ENoseGUI(QMainWindow):
         default_filename = f"{sample_name}_{timestamp}.csv"
         
         filename, _ = QFileDialog.getSaveFileName(
-            self, "Save CSV", default_filename, "CSV Files (*.csv)"
+            self, "Save CSV", default_filename, _CSV_FILE_FILTER
         )
         
         if not filename:
             return
         
         try:
-            collection_date = self.current_sample_data[0]['timestamp']
+            columns = self.current_sample_data.text_columns()
+            # sample_name and collection_date (first timestamp) are the same on
+            # every row, so they are baked into the row format once
+            prefix = f"{_csv_field(sample_name)},{columns[0][0]},"
+            row_fmt = prefix.replace('%', '%%') + _CSV_ROW_FMT
             
-            with open(filename, 'w', newline='') as csvfile:
-                fieldnames = ['sample_name', 'collection_date', 'timestamp'] + list(SENSORS.keys())
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for row in self.current_sample_data:
-                    csv_row = {
-                        'sample_name': sample_name,
-                        'collection_date': collection_date,
-                        'timestamp': row['timestamp']
-                    }
-                    for sensor in SENSORS.keys():
-                        csv_row[sensor] = row.get(sensor, '')
-                    writer.writerow(csv_row)
+            with open(filename, 'w', newline='', buffering=CSV_WRITE_BUFFER) as csvfile:
+                csvfile.write(_CSV_HEADER)
+                csvfile.write(''.join([row_fmt % row for row in zip(*columns)]))
             
             self.log.append(f"💾 Saved: {filename}")
             self.log.append(f"📊 {len(self.current_sample_data)} samples")
@@ -970,9 +1300,7 @@ class ENoseGUI(QMainWindow):
     def upload_to_edge_impulse_clicked(self):
         """Upload saved CSV file to Edge Impulse"""
         # Get API credentials
-        api_key = self.ei_api_key_input.text().strip()
-        project_id = self.ei_project_id_input.text().strip()
-        label = self.ei_label_input.text().strip()
+        api_key, project_id, label = self._ei_credentials()
         
         # Validate inputs
         if not api_key:
@@ -989,7 +1317,7 @@ class ENoseGUI(QMainWindow):
         
         # Select CSV file to upload
         filename, _ = QFileDialog.getOpenFileName(
-            self, "Select CSV File to Upload", "", "CSV Files (*.csv)"
+            self, "Select CSV File to Upload", "", _CSV_FILE_FILTER
         )
         
         if not filename:
@@ -997,35 +1325,39 @@ class ENoseGUI(QMainWindow):
         
         # Upload to Edge Impulse
         self.log.append(f"📤 Uploading {filename} to Edge Impulse...")
-        
+        # Upload runs in a worker thread; the GUI and recv loop keep running
+        self._csv_upload_task = asyncio.create_task(
+            self._upload_csv(filename, api_key, project_id, label)
+        )
+
+    async def _upload_csv(self, filename: str, api_key: str, project_id: str, label: str):
+        """Upload file CSV ke Edge Impulse tanpa memblokir GUI"""
         try:
             if EDGE_IMPULSE_AVAILABLE and self.ei_handler:
-                result = self.ei_handler.upload_csv_to_edge_impulse(
-                    csv_file_path=filename,
-                    api_key=api_key,
-                    project_id=project_id,
-                    label=label
-                )
+                upload = self.ei_handler.upload_csv_to_edge_impulse
             else:
                 # Use static method if handler not available
-                from utils import EdgeImpulseHandler
-                result = EdgeImpulseHandler.upload_csv_to_edge_impulse(
-                    csv_file_path=filename,
-                    api_key=api_key,
-                    project_id=project_id,
-                    label=label
-                )
+                upload = _ei_handler_cls().upload_csv_to_edge_impulse
+
+            result = await asyncio.to_thread(
+                upload,
+                csv_file_path=filename,
+                api_key=api_key,
+                project_id=project_id,
+                label=label
+            )
             
             if result['success']:
                 self.log.append(f"✅ {result['message']}")
-                QMessageBox.information(
-                    self, 
+                self._show_after_task(
+                    self.show_info,
                     "Upload Successful", 
                     f"{result['message']}\n\nLabel: {label}"
                 )
             else:
                 self.log.append(f"❌ {result['message']}")
-                QMessageBox.warning(
+                self._show_after_task(
+                    QMessageBox.warning,
                     self, 
                     "Upload Failed", 
                     result['message']
@@ -1033,7 +1365,7 @@ class ENoseGUI(QMainWindow):
         except Exception as e:
             error_msg = f"Error during upload: {str(e)}"
             self.log.append(f"❌ {error_msg}")
-            QMessageBox.critical(self, "Upload Error", error_msg)
+            self._show_after_task(QMessageBox.critical, self, "Upload Error", error_msg)
 
     def load_model_clicked(self):
         """Open file dialog to load Edge Impulse model"""
@@ -1046,91 +1378,149 @@ class ENoseGUI(QMainWindow):
             return
             
         filename, _ = QFileDialog.getOpenFileName(
-            self, "Select Edge Impulse Model", "", "EIM Files (*.eim);;All Files (*)"
+            self, "Select Edge Impulse Model", "", _EIM_FILE_FILTER
         )
         
         if filename:
-            if self.ei_handler.load_model(filename):
-                self.log.append(f"🧠 Model loaded: {filename}")
-                QMessageBox.information(self, "Success", "Model loaded successfully!")
-            else:
-                self.log.append("❌ Failed to load model")
-                QMessageBox.warning(self, "Error", "Failed to load model.")
+            self.log.append(f"🧠 Loading model: {filename}...")
+            self._model_task = asyncio.create_task(self._load_model(filename))
+
+    async def _load_model(self, filename: str):
+        """Load model di worker classify agar tidak bentrok dengan classify() yang berjalan"""
+        # Same single worker as classify: the runner is never swapped mid-inference
+        future = self._ei_executor.submit(self.ei_handler.load_model, filename)
+        if await asyncio.wrap_future(future):
+            self.log.append(f"🧠 Model loaded: {filename}")
+            self._show_after_task(self.show_info, "Success", "Model loaded successfully!")
+        else:
+            self.log.append("❌ Failed to load model")
+            self._show_after_task(QMessageBox.warning, self, "Error", "Failed to load model.")
 
     # Async methods
+    def _set_status(self, text: str, qss: str):
+        """Update status label; skip re-polish if status tidak berubah"""
+        if qss is self._status_qss:
+            return
+        self._status_qss = qss
+        self.status.setText(text)
+        self.status.setStyleSheet(qss)
+
     async def connect_backend(self):
         """Connect to backend server"""
         while True:
             try:
-                self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self._sock.setblocking(False)
-                await asyncio.get_event_loop().sock_connect(self._sock, (BACKEND_HOST, BACKEND_PORT))
+                reader, self._writer = await asyncio.open_connection(BACKEND_HOST, BACKEND_PORT)
 
                 self.connected = True
-                self.status.setText("🟢 Connected")
-                self.status.setStyleSheet("""
-                    QLabel {
-                        color: #00d9ff; 
-                        padding: 12px; 
-                        background: rgba(0, 217, 255, 0.2); 
-                        border-radius: 10px;
-                        border: 1px solid rgba(0, 217, 255, 0.4);
-                        font-size: 11pt;
-                    }
-                """)
+                self._set_status("🟢 Connected", QSS_STATUS_CONNECTED)
                 self.log.append("🟢 Connected to backend!")
-                await self.recv_loop()
+                # Returns normally once the backend closes or the read fails
+                await self.recv_loop(reader)
 
             except Exception as e:
-                self.connected = False
-                self.status.setText("🔴 Disconnected")
-                self.status.setStyleSheet("""
-                    color: #0096c7; 
-                    padding: 8px; 
-                    background: rgba(0, 150, 199, 0.15); 
-                    border-radius: 8px;
-                """)
-                self.log.append(f"⚠️ Reconnect in {RECONNECT_DELAY}s...")
-                await asyncio.sleep(RECONNECT_DELAY)
-
-    async def recv_loop(self):
+                pass  # Connect failed; cleanup and retry below
+            finally:
+                # Runs on every disconnect, so the old writer is always closed
+                await self._close_connection()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _close_connection(self):
+        """Tutup writer lama dan set status disconnected"""
+        self.connected = False
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass  # Connection already reset by the peer
+        self._set_status("🔴 Disconnected", QSS_STATUS_DISCONNECTED)
+        self.log.append(f"⚠️ Reconnect in {RECONNECT_DELAY}s...")
+
+    async def recv_loop(self, reader: asyncio.StreamReader):
         """Receive data forever until disconnected"""
-        loop = asyncio.get_event_loop()
+        # Unparsed bytes (a partial line) carried between reads; each newline
+        # search only scans the freshly received chunk
+        pending = bytearray()
 
         while True:
             try:
-                data = await loop.sock_recv(self._sock, 4096)
+                data = await reader.read(RECV_CHUNK_SIZE)
                 if not data:
                     raise ConnectionError("Backend closed")
 
-                for line in data.decode(errors="ignore").splitlines():
-                    line = line.strip()
-                    if line:
-                        if line == "SAMPLING_COMPLETE":
-                            signal_emitter.sampling_complete.emit()
-                            continue
-                        elif line == "SAMPLING_STOPPED":
-                            self.is_sampling = False
-                            self.log.append("⏹ Stopped")
-                            continue
-                        
-                        try:
-                            obj = json.loads(line)
-                            signal_emitter.data_received.emit(obj)
-                        except:
-                            self.log.append(f"📝 {line}")
+                if pending:
+                    scan = len(pending)
+                    pending += data
+                    buf = pending
+                else:
+                    # Common case: the chunk starts on a line boundary, so scan
+                    # it in place instead of copying it into `pending` first
+                    scan = 0
+                    buf = data
+                start = 0
+                while (nl := buf.find(b"\n", scan)) != -1:
+                    self._handle_line(buf[start:nl])
+                    start = scan = nl + 1
+                self._flush_packets()
+
+                if buf is pending:
+                    # Dropping a consumed prefix of a bytearray is O(1) in CPython
+                    del pending[:start]
+                elif start < len(data):
+                    pending += memoryview(data)[start:]
+                if len(pending) > RECV_BUFFER_SIZE:
+                    # A single line without newline grew too large, drop it
+                    self.log.append("⚠️ Oversized line dropped")
+                    pending.clear()
 
             except Exception as e:
                 self.log.append(f"⚠️ Disconnected")
                 break
 
+    def _handle_line(self, line: bytes):
+        """Dispatch satu baris lengkap dari backend (bytes, di-decode hanya jika perlu)"""
+        line = line.strip()
+        if not line:
+            return
+
+        if line == b"SAMPLING_COMPLETE":
+            self._flush_packets()  # deliver preceding packets first
+            signal_emitter.sampling_complete.emit()
+            return
+        elif line == b"SAMPLING_STOPPED":
+            self._flush_packets()
+            self.is_sampling = False
+            self.log.append("⏹ Stopped")
+            return
+
+        # json.loads and orjson.loads both take UTF-8 bytes directly
+        try:
+            obj = _json_loads(line)
+        except ValueError:
+            obj = None
+
+        packet = _normalize_packet(obj)
+        if packet is None:
+            self._flush_packets()  # keep log order
+            self.log.append(f"📝 {line.decode(errors='ignore')}")
+        else:
+            self._packets.append(packet)
+
+    def _flush_packets(self):
+        """Emit packet yang terkumpul sebagai satu batch"""
+        if self._packets:
+            packets, self._packets = self._packets, []
+            signal_emitter.data_received.emit(packets)
+
     async def send_cmd(self, cmd: str):
         """Send command ke backend"""
         if not self.connected:
             self.log.append("❌ Not connected!")
             return
         try:
-            await asyncio.get_event_loop().sock_sendall(self._sock, (cmd + "\n").encode())
+            self._writer.write(_CMD_BYTES.get(cmd) or (cmd + "\n").encode())
+            await self._writer.drain()
             self.log.append(f"➡️ {cmd}")
             
             if cmd == "STOP_SAMPLING":
@@ -1140,8 +1530,22 @@ class ENoseGUI(QMainWindow):
 
 
 # ==================== MAIN ENTRY POINT ====================
+def configure_pyqtgraph():
+    """Set global pyqtgraph options (harus dipanggil sebelum widget dibuat)"""
+    # OpenGL curve drawing is opt-in (GRAPH_USE_OPENGL) and also needs PyOpenGL;
+    # numba JIT kernels are used whenever numba is installed.
+    use_opengl = GRAPH_USE_OPENGL and importlib.util.find_spec("OpenGL") is not None
+    pg.setConfigOptions(
+        antialias=False,
+        useOpenGL=use_opengl,
+        enableExperimental=use_opengl,
+        useNumba=importlib.util.find_spec("numba") is not None,
+    )
+
+
 def main():
     """Main entry point untuk E-NOSE Dashboard"""
+    configure_pyqtgraph()
     app = QApplication(sys.argv)
     loop = qasync.QEventLoop(app)
     asyncio.set_event_loop(loop)
@@ -4,16 +4,32 @@ E-Nose Utilities - Edge Impulse Handler
 
 import csv
 import json
+import threading
+from operator import itemgetter
 from typing import Optional, Dict, Any
 
+import numpy as np
+
+from config import SENSOR_NAMES, EDGE_IMPULSE_API_URL, EDGE_IMPULSE_UPLOAD_TIMEOUT
+
 # Try to import requests (required for Edge Impulse upload)
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
     # Note: Error message will be shown by main.py if needed
 
+# Try to import orjson (optional, faster serialization of upload payloads)
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), allow_nan=False).encode()
+
 # Try to import Edge Impulse (optional for model loading)
 try:
     from edge_impulse_linux.runner import ImpulseRunner
@@ -24,6 +40,39 @@ except (ImportError, ModuleNotFoundError) as e:
     # Note: Error message will be shown by main.py if needed
 
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> "requests.Session":
+    """
+    Session keep-alive bersama untuk semua upload Edge Impulse (dibuat sekali)
+    
+    Koneksi TLS ke server ingestion dipakai ulang antar upload. Connection
+    error dan status 429/502/503/504 di-retry dengan backoff; status 500 tidak,
+    karena server mungkin sudah menyimpan data.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=3,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset({"POST"}),
+                raise_on_status=False,
+            )
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+            _session = session
+    return _session
+
+
+# Model input order is the config sensor order: NO2, ETH, VOC, CO, COM, ETHM, VOCM
+_get_features = itemgetter(*SENSOR_NAMES)
+
+
 class EdgeImpulseHandler:
     """Handler untuk Edge Impulse model loading dan classification"""
     
@@ -50,6 +99,8 @@ class EdgeImpulseHandler:
             print("❌ Edge Impulse library not installed. Cannot load model.")
             return False
             
+        # Old model is unusable from here until the new runner finishes init()
+        self.initialized = False
         try:
             if self.runner:
                 try:
@@ -82,22 +133,76 @@ class EdgeImpulseHandler:
             return None
 
         # Mapping sensor data to features expected by the model
-        features = []
         try:
-            # Order: NO2, ETH, VOC, CO, COM, ETHM, VOCM
-            feature_keys = ["NO2", "ETH", "VOC", "CO", "COM", "ETHM", "VOCM"]
-            for key in feature_keys:
-                if key in data:
-                    features.append(float(data[key]))
-                else:
-                    return None  # Missing data for classification
-            
-            res = self.runner.classify(features)
+            # All seven lookups in one C-level itemgetter call
+            values = _get_features(data)
+        except KeyError:
+            return None  # Missing data for classification
+
+        try:
+            res = self.runner.classify(list(map(float, values)))
             return res["result"]
         except Exception as e:
             print(f"❌ Classification error: {e}")
             return None
 
+    @staticmethod
+    def _post_samples(
+        timestamps: list,
+        values: np.ndarray,
+        api_key: str,
+        project_id: str,
+        label: str
+    ) -> Dict[str, Any]:
+        """
+        Kirim samples ke Edge Impulse ingestion API (dipakai kedua upload_*)
+        
+        Args:
+            timestamps: Timestamp per sample
+            values: Array (n_samples, len(SENSOR_NAMES)) nilai sensor
+            
+        Returns:
+            Dictionary with 'success' (bool) and 'message' (str) keys;
+            network errors are raised to the caller
+        """
+        # Edge Impulse expects JSON format with structured data; one tolist()
+        # converts the whole array before the per-sample dicts are built
+        samples = [
+            {'timestamp': ts, 'values': dict(zip(SENSOR_NAMES, row))}
+            for ts, row in zip(timestamps, values.tolist())
+        ]
+        
+        payload = {
+            'protected': False,
+            'label': label,
+            'samples': samples
+        }
+        
+        # Headers with authentication
+        headers = {
+            'x-api-key': api_key,
+            'x-project-id': project_id,
+            'Content-Type': 'application/json'
+        }
+        
+        # Serialize once to UTF-8 bytes and send them as-is
+        response = _get_session().post(
+            EDGE_IMPULSE_API_URL,
+            headers=headers,
+            data=_json_dumps(payload),
+            timeout=EDGE_IMPULSE_UPLOAD_TIMEOUT
+        )
+        
+        if response.status_code == 200 or response.status_code == 201:
+            return {
+                'success': True,
+                'message': f'Successfully uploaded {len(samples)} samples to Edge Impulse'
+            }
+        return {
+            'success': False,
+            'message': f'Upload failed: {response.status_code} - {response.text}'
+        }
+
     @staticmethod
     def upload_csv_to_edge_impulse(
         csv_file_path: str,
@@ -124,70 +229,34 @@ class EdgeImpulseHandler:
             }
         
         try:
-            # Read CSV file
-            with open(csv_file_path, 'r') as f:
-                csv_reader = csv.DictReader(f)
-                rows = list(csv_reader)
+            # Read CSV file (csv.reader handles quoted sample names)
+            with open(csv_file_path, 'r', newline='') as f:
+                csv_reader = csv.reader(f)
+                header = next(csv_reader, [])
+                table = np.array([row for row in csv_reader if row], dtype=str)
             
-            if not rows:
+            if not len(table):
                 return {
                     'success': False,
                     'message': 'CSV file is empty'
                 }
             
-            # Prepare data for Edge Impulse
-            # Edge Impulse expects JSON format with structured data
-            samples = []
-            for row in rows:
-                sample = {
-                    'timestamp': row.get('timestamp', ''),
-                    'values': {
-                        'NO2': float(row.get('NO2', 0)),
-                        'ETH': float(row.get('ETH', 0)),
-                        'VOC': float(row.get('VOC', 0)),
-                        'CO': float(row.get('CO', 0)),
-                        'COM': float(row.get('COM', 0)),
-                        'ETHM': float(row.get('ETHM', 0)),
-                        'VOCM': float(row.get('VOCM', 0))
-                    }
-                }
-                samples.append(sample)
-            
-            # Prepare payload
-            payload = {
-                'protected': False,
-                'label': label,
-                'samples': samples
-            }
-            
-            # API endpoint
-            url = f"https://ingestion.edgeimpulse.com/api/training/data"
-            
-            # Headers with authentication
-            headers = {
-                'x-api-key': api_key,
-                'x-project-id': project_id,
-                'Content-Type': 'application/json'
-            }
-            
-            # Send request
-            response = requests.post(
-                url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            # Convert each sensor column in one vectorized pass; a missing
+            # column or empty cell (sensor absent in that packet) becomes 0
+            columns = {name: i for i, name in enumerate(header)}
+            values = np.zeros((len(table), len(SENSOR_NAMES)))
+            for j, key in enumerate(SENSOR_NAMES):
+                i = columns.get(key)
+                if i is not None:
+                    col = table[:, i]
+                    values[:, j] = np.where(col == '', '0', col).astype(np.float64)
             
-            if response.status_code == 200 or response.status_code == 201:
-                return {
-                    'success': True,
-                    'message': f'Successfully uploaded {len(samples)} samples to Edge Impulse'
-                }
+            if 'timestamp' in columns:
+                timestamps = table[:, columns['timestamp']].tolist()
             else:
-                return {
-                    'success': False,
-                    'message': f'Upload failed: {response.status_code} - {response.text}'
-                }
+                timestamps = [''] * len(table)
+            
+            return EdgeImpulseHandler._post_samples(timestamps, values, api_key, project_id, label)
                 
         except FileNotFoundError:
             return {
@@ -207,7 +276,8 @@ class EdgeImpulseHandler:
 
     @staticmethod
     def upload_data_to_edge_impulse(
-        data: list,
+        timestamps: list,
+        values: np.ndarray,
         api_key: str,
         project_id: str,
         label: str = "unknown"
@@ -216,7 +286,8 @@ class EdgeImpulseHandler:
         Upload data directly to Edge Impulse (without CSV file) for real-time integration
         
         Args:
-            data: List of dictionaries with sensor data (from current_sample_data)
+            timestamps: Timestamp per sample (from current_sample_data)
+            values: Array (n_samples, len(SENSOR_NAMES)) nilai sensor; missing sensors as 0
             api_key: Edge Impulse API key
             project_id: Edge Impulse project ID
             label: Label for the data (default: "unknown")
@@ -231,64 +302,13 @@ class EdgeImpulseHandler:
             }
         
         try:
-            if not data:
+            if not len(timestamps):
                 return {
                     'success': False,
                     'message': 'No data to upload'
                 }
             
-            # Prepare data for Edge Impulse
-            samples = []
-            for row in data:
-                sample = {
-                    'timestamp': row.get('timestamp', ''),
-                    'values': {
-                        'NO2': float(row.get('NO2', 0)),
-                        'ETH': float(row.get('ETH', 0)),
-                        'VOC': float(row.get('VOC', 0)),
-                        'CO': float(row.get('CO', 0)),
-                        'COM': float(row.get('COM', 0)),
-                        'ETHM': float(row.get('ETHM', 0)),
-                        'VOCM': float(row.get('VOCM', 0))
-                    }
-                }
-                samples.append(sample)
-            
-            # Prepare payload
-            payload = {
-                'protected': False,
-                'label': label,
-                'samples': samples
-            }
-            
-            # API endpoint
-            url = "https://ingestion.edgeimpulse.com/api/training/data"
-            
-            # Headers with authentication
-            headers = {
-                'x-api-key': api_key,
-                'x-project-id': project_id,
-                'Content-Type': 'application/json'
-            }
-            
-            # Send request
-            response = requests.post(
-                url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200 or response.status_code == 201:
-                return {
-                    'success': True,
-                    'message': f'Successfully uploaded {len(samples)} samples to Edge Impulse'
-                }
-            else:
-                return {
-                    'success': False,
-                    'message': f'Upload failed: {response.status_code} - {response.text}'
-                }
+            return EdgeImpulseHandler._post_samples(timestamps, values, api_key, project_id, label)
                 
         except requests.exceptions.RequestException as e:
             return {